@@ -0,0 +1,189 @@
+import hashlib
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from pydantic import ValidationError
+
+from app.flexline.client import FlexlineClient, FlexlineError
+from app.text2sql.client import Text2SQLClient
+
+from .schemas import BatchItem, BatchResult, BatchSummary
+from .writers import ResultWriter
+
+logger = logging.getLogger(__name__)
+
+
+def _item_id(text: str) -> str:
+    """Derives a stable id from the item text so resumed runs match it."""
+    return hashlib.sha1(text.strip().encode()).hexdigest()[:12]
+
+
+def load_items(path: str, as_sql: bool = False) -> list[BatchItem]:
+    """
+    Loads batch items from a file.
+
+    `.jsonl` files hold one object per line with a `question` or `sql_query`
+    key and an optional `id`. Any other file is read as one question per line
+    (or one SQL statement per line when `as_sql` is set); blank lines and lines
+    starting with `#` are ignored. Repeated items (same id) are loaded once.
+
+    Raises:
+        ValueError: If a `.jsonl` line is not valid JSON or has neither a
+            `question` nor a `sql_query`.
+    """
+    items: dict[str, BatchItem] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        if os.path.splitext(path)[1].lower() == ".jsonl":
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_number}: invalid JSON ({e}).")
+                text = record.get("sql_query") or record.get("question")
+                if not isinstance(text, str) or not text.strip():
+                    raise ValueError(
+                        f"{path}:{line_number}: record has neither a 'question' "
+                        "nor a 'sql_query'."
+                    )
+                record.setdefault("id", _item_id(text))
+                try:
+                    item = BatchItem.model_validate(record)
+                except ValidationError as e:
+                    raise ValueError(f"{path}:{line_number}: invalid record. {e}")
+                items.setdefault(item.id, item)
+        else:
+            for line in f:
+                text = line.strip()
+                if not text or text.startswith("#"):
+                    continue
+                key = "sql_query" if as_sql else "question"
+                item = BatchItem(id=_item_id(text), **{key: text})
+                items.setdefault(item.id, item)
+    return list(items.values())
+
+
+class BatchRunner:
+    """
+    Runs batch items through `Text2SQLClient` and `FlexlineClient` using a
+    bounded thread pool, with separate concurrency limits per backend.
+    """
+
+    def __init__(
+        self,
+        text2sql_client: Text2SQLClient | None,
+        flexline_client: FlexlineClient | None,
+        max_workers: int = 8,
+        text2sql_concurrency: int = 4,
+        flexline_concurrency: int = 2,
+    ):
+        self.text2sql_client = text2sql_client
+        self.flexline_client = flexline_client
+        self.max_workers = max_workers
+        self._text2sql_slots = threading.BoundedSemaphore(text2sql_concurrency)
+        self._flexline_slots = threading.BoundedSemaphore(flexline_concurrency)
+
+    def _process(self, item: BatchItem) -> BatchResult:
+        result = BatchResult(
+            id=item.id,
+            question=item.question,
+            sql_query=item.sql_query,
+            status="ok",
+        )
+        try:
+            if not result.sql_query:
+                if not self.text2sql_client:
+                    raise ValueError("Item has no SQL and no Text2SQL client is set.")
+                with self._text2sql_slots:
+                    # Timed inside the slot so waiting for it is not counted
+                    start = time.perf_counter()
+                    try:
+                        response = self.text2sql_client.get_sql(item.question)
+                    finally:
+                        result.sql_seconds = time.perf_counter() - start
+                if not response:
+                    raise ValueError(
+                        "Failed to get a valid read-only SQL query from the AI."
+                    )
+                result.sql_query = response.get("sql_query")
+                result.explanation = response.get("explanation")
+
+            if self.flexline_client:
+                with self._flexline_slots:
+                    start = time.perf_counter()
+                    try:
+                        rows = self.flexline_client.run(result.sql_query)
+                    finally:
+                        result.query_seconds = time.perf_counter() - start
+                if isinstance(rows, dict):
+                    rows = [rows]
+                result.row_count = len(rows) if isinstance(rows, list) else 0
+                result.rows = json.dumps(rows, default=str)
+        except (FlexlineError, ValueError) as e:
+            result.status = "error"
+            result.error = str(e)
+        except Exception as e:
+            logger.exception(f"Unexpected error processing batch item '{item.id}'")
+            result.status = "error"
+            result.error = f"Unexpected error: {e}"
+        return result
+
+    def run(
+        self, items: list[BatchItem], writer: ResultWriter, retry_failed: bool = False
+    ) -> BatchSummary:
+        """
+        Processes `items` and writes each result as soon as it completes.
+        Items already written to the writer's output are skipped, except
+        failed ones when `retry_failed` is set.
+        """
+        summary = BatchSummary(total=len(items))
+        recorded = writer.recorded_statuses()
+        pending = [
+            item
+            for item in items
+            if item.id not in recorded
+            or (retry_failed and recorded[item.id] != "ok")
+        ]
+        summary.skipped = len(items) - len(pending)
+        if summary.skipped:
+            logger.info(f"Skipping {summary.skipped} items recorded in a previous run.")
+
+        start = time.perf_counter()
+        remaining = iter(pending)
+        # Only a bounded window of items is in flight, and each future is
+        # dropped once its result is written, so finished result sets do not
+        # accumulate in memory
+        in_flight = set()
+        with writer, ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                for item in itertools.islice(remaining, self.max_workers * 2):
+                    in_flight.add(executor.submit(self._process, item))
+                while in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        writer.write(result)
+                        summary.sql_seconds += result.sql_seconds
+                        summary.query_seconds += result.query_seconds
+                        if result.status == "ok":
+                            summary.succeeded += 1
+                        else:
+                            summary.failed += 1
+                            logger.warning(f"Item '{result.id}' failed: {result.error}")
+                        item = next(remaining, None)
+                        if item is not None:
+                            in_flight.add(executor.submit(self._process, item))
+            except BaseException:
+                logger.warning("Batch run aborted, cancelling pending items...")
+                for future in in_flight:
+                    future.cancel()
+                raise
+            finally:
+                summary.elapsed_seconds = time.perf_counter() - start
+        return summary
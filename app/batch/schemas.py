@@ -0,0 +1,55 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class BatchItem(BaseModel):
+    id: str
+    question: str | None = None
+    sql_query: str | None = None
+
+
+class BatchResult(BaseModel):
+    id: str
+    question: str | None = None
+    sql_query: str | None = None
+    explanation: str | None = None
+    status: Literal["ok", "error"]
+    error: str | None = None
+    row_count: int = 0
+    # Rows are serialized as a JSON string so every output format shares one
+    # flat, fixed schema regardless of the columns each query returns.
+    rows: str | None = None
+    sql_seconds: float = 0.0
+    query_seconds: float = 0.0
+
+
+class BatchSummary(BaseModel):
+    total: int = 0
+    skipped: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+    sql_seconds: float = 0.0
+    query_seconds: float = 0.0
+
+    @property
+    def processed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def items_per_second(self) -> float:
+        if not self.elapsed_seconds:
+            return 0.0
+        return self.processed / self.elapsed_seconds
+
+    def format(self) -> str:
+        """Returns a human-readable throughput summary."""
+        avg_sql = self.sql_seconds / self.processed if self.processed else 0.0
+        avg_query = self.query_seconds / self.processed if self.processed else 0.0
+        return (
+            f"Processed {self.processed} of {self.total} items "
+            f"({self.succeeded} ok, {self.failed} failed, {self.skipped} skipped) "
+            f"in {self.elapsed_seconds:.1f}s - {self.items_per_second:.2f} items/s, "
+            f"avg SQL generation {avg_sql:.2f}s, avg query execution {avg_query:.2f}s"
+        )
@@ -0,0 +1,195 @@
+import csv
+import glob
+import json
+import logging
+import os
+import sys
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+
+from .schemas import BatchResult
+
+logger = logging.getLogger(__name__)
+
+FIELDNAMES = list(BatchResult.model_fields)
+
+
+class ResultWriter(ABC):
+    """Base class for writers that persist batch results one at a time."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def recorded_statuses(self) -> dict[str, str]:
+        """
+        Returns the status of every item already written to `path`. When an
+        item was written more than once, its latest status wins.
+        """
+        if not os.path.exists(self.path):
+            return {}
+        return {
+            record["id"]: record.get("status")
+            for record in self._read_existing()
+        }
+
+    @abstractmethod
+    def _read_existing(self) -> Iterator[dict]:
+        """Yields the `id` and `status` of each result already written."""
+
+    @abstractmethod
+    def open(self):
+        pass
+
+    @abstractmethod
+    def write(self, result: BatchResult):
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class JsonlWriter(ResultWriter):
+    def _read_existing(self) -> Iterator[dict]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A partially written last line from an interrupted run
+                    continue
+                yield {"id": record["id"], "status": record.get("status")}
+
+    def open(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def write(self, result: BatchResult):
+        self._file.write(result.model_dump_json() + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class CsvWriter(ResultWriter):
+    def _read_existing(self) -> Iterator[dict]:
+        # The `rows` column holds whole result sets, well past the default limit
+        field_size_limit = csv.field_size_limit(sys.maxsize)
+        try:
+            with open(self.path, "r", encoding="utf-8", newline="") as f:
+                for record in csv.DictReader(f):
+                    yield {"id": record["id"], "status": record.get("status")}
+        finally:
+            csv.field_size_limit(field_size_limit)
+
+    def open(self):
+        write_header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self._file = open(self.path, "a", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=FIELDNAMES)
+        if write_header:
+            self._writer.writeheader()
+
+    def write(self, result: BatchResult):
+        self._writer.writerow(result.model_dump())
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter(ResultWriter):
+    """
+    Writes results into a directory of part files (`path/part-00000.parquet`,
+    ...), starting a new part every `rows_per_part` results. Each part is
+    written to a temporary file and renamed once complete, so a crash loses
+    at most the results of the part in progress and never corrupts earlier
+    parts. Resumed runs add new parts next to the existing ones.
+    """
+
+    def __init__(self, path: str, rows_per_part: int = 50):
+        super().__init__(path)
+        self.rows_per_part = rows_per_part
+
+    def _part_paths(self) -> list[str]:
+        return sorted(glob.glob(os.path.join(self.path, "part-*.parquet")))
+
+    def _read_existing(self) -> Iterator[dict]:
+        import pyarrow.parquet as pq
+
+        for part_path in self._part_paths():
+            table = pq.read_table(part_path, columns=["id", "status"])
+            yield from table.to_pylist()
+
+    def open(self):
+        import pyarrow as pa
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("id", pa.string()),
+                ("question", pa.string()),
+                ("sql_query", pa.string()),
+                ("explanation", pa.string()),
+                ("status", pa.string()),
+                ("error", pa.string()),
+                ("row_count", pa.int64()),
+                ("rows", pa.string()),
+                ("sql_seconds", pa.float64()),
+                ("query_seconds", pa.float64()),
+            ]
+        )
+        os.makedirs(self.path, exist_ok=True)
+        parts = self._part_paths()
+        self._next_part = (
+            int(os.path.basename(parts[-1])[len("part-") : -len(".parquet")]) + 1
+            if parts
+            else 0
+        )
+        self._pending: list[dict] = []
+
+    def _flush(self):
+        import pyarrow.parquet as pq
+
+        if not self._pending:
+            return
+        part_path = os.path.join(self.path, f"part-{self._next_part:05d}.parquet")
+        # Stale temporary files from a crashed run are simply overwritten
+        tmp_path = f"{part_path}.tmp"
+        table = self._pa.Table.from_pylist(self._pending, schema=self._schema)
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, part_path)
+        self._next_part += 1
+        self._pending = []
+
+    def write(self, result: BatchResult):
+        self._pending.append(result.model_dump())
+        if len(self._pending) >= self.rows_per_part:
+            self._flush()
+
+    def close(self):
+        self._flush()
+
+
+WRITERS = {
+    ".jsonl": JsonlWriter,
+    ".csv": CsvWriter,
+    ".parquet": ParquetWriter,
+}
+
+
+def get_writer(path: str) -> ResultWriter:
+    """Returns the writer matching the output file extension."""
+    extension = os.path.splitext(path.rstrip("/"))[1].lower()
+    try:
+        return WRITERS[extension](path)
+    except KeyError:
+        raise ValueError(
+            f"Unsupported output format '{extension}'. Use one of: {', '.join(WRITERS)}"
+        )
@@ -5,6 +5,14 @@ import logging
 import boto3
 from pydantic import ValidationError
 
+from app.prewarm.cache import QueryCache
+
+from .payload import (
+    DEFAULT_MAX_RESPONSE_BYTES,
+    PayloadTooLargeError,
+    read_lambda_payload,
+)
+
 # Import the schema from the new file
 from .schemas import QueryInfo
 
@@ -29,8 +37,12 @@ class FlexlineClient:
         api_key: str,
         username: str,
         password: str,
+        cache: QueryCache | None = None,
+        max_response_bytes: int = DEFAULT_MAX_RESPONSE_BYTES,
     ):
         self.api_key = api_key
+        self.cache = cache
+        self.max_response_bytes = max_response_bytes
         self.username = username
         self.password = password
         self.client = boto3.client(
@@ -57,11 +69,19 @@ class FlexlineClient:
             response = self.client.invoke(
                 FunctionName=lambda_name, Payload=json.dumps(request_payload).encode()
             )
-            payload = response["Payload"].read().decode()
-            response_payload = json.loads(payload)
+            # Fail fast when the declared size is already over budget
+            headers = response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+            content_length = int(headers.get("content-length", 0))
+            if content_length > self.max_response_bytes:
+                response["Payload"].close()
+                raise PayloadTooLargeError(
+                    f"Response of {content_length:,} bytes exceeds the limit of "
+                    f"{self.max_response_bytes:,} bytes."
+                )
 
-            status_code = response_payload.get("statusCode")
-            response_body = json.loads(response_payload.get("body", "{}"))
+            status_code, response_body = read_lambda_payload(
+                response["Payload"], max_bytes=self.max_response_bytes
+            )
 
             if status_code != 200:
                 raise FlexlineError(
@@ -69,6 +89,11 @@ class FlexlineClient:
                 )
 
             return response_body
+        except PayloadTooLargeError as e:
+            raise FlexlineError(
+                f"Lambda function '{lambda_name}' returned too much data. {e} "
+                "Please narrow down the query."
+            )
         except Exception as e:
             logger.error(f"Error invoking Lambda function '{lambda_name}': {e}")
             raise FlexlineError(f"Failed to communicate with AWS Lambda. {e}")
@@ -101,7 +126,18 @@ class FlexlineClient:
         body_payload = query_info.model_dump(by_alias=True, exclude_none=True)
         return self._invoke_lambda("FlexlineData", body=body_payload)
 
-    def run(self, sql_query: str) -> list[dict]:
+    def run(self, sql_query: str, use_cache: bool = True) -> list[dict]:
+        """
+        Executes the query. Results pre-warmed into the cache are served
+        instead unless `use_cache` is False; other results are not cached.
+        """
+        if self.cache:
+            self.cache.record_sql(sql_query)
+            cached = self.cache.get_results(sql_query) if use_cache else None
+            if cached is not None:
+                logger.info("Serving pre-warmed Flexline results from cache.")
+                return cached
+
         logger.info("Starting Flexline Lambda execution run.")
         token = self._get_auth_token()
         query_info = self._get_route(token)
@@ -0,0 +1,257 @@
+import codecs
+import json
+import re
+from typing import Any
+
+# AWS Lambda caps synchronous response payloads at 6 MB
+DEFAULT_MAX_RESPONSE_BYTES = 6 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+# Body string content up to the closing quote or an incomplete escape sequence
+_STRING_CONTENT = re.compile(r'(?:[^"\\]++|\\[^u]|\\u[0-9a-fA-F]{4})*+')
+_HIGH_SURROGATE_TAIL = re.compile(r"\\u[dD][89abAB][0-9a-fA-F]{2}$")
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+class PayloadTooLargeError(ValueError):
+    """Raised when a Lambda response exceeds the configured byte budget."""
+
+    pass
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _decode_value(
+    text: str, pos: int, final: bool, decoder: json.JSONDecoder = _decoder
+) -> tuple[Any, int] | None:
+    """
+    Decodes the JSON value starting at `pos`, or returns None if more input is
+    needed. Unless `final`, a value ending at the end of the buffer or right
+    before number characters is treated as incomplete, since a number split
+    across chunks (e.g. "-2." + "5e10") decodes early otherwise.
+    """
+    try:
+        value, end = decoder.raw_decode(text, pos)
+    except json.JSONDecodeError:
+        if final:
+            raise
+        return None
+    if not final and (end == len(text) or text[end] in _NUMBER_CHARS):
+        return None
+    return value, end
+
+
+class _BodyParser:
+    """
+    Incrementally parses the decoded `body` JSON. Arrays (the shape of
+    `for json path` results) are parsed element by element as text arrives;
+    any other value is buffered and decoded once complete.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._rows: list | None = None
+        # json only shares key strings within a single decode call, so rows
+        # decoded one by one share them through this memo instead
+        self._keys: dict[str, str] = {}
+        self._decoder = json.JSONDecoder(object_pairs_hook=self._make_object)
+        self._expect_element = True
+        self._done = False
+
+    def _make_object(self, pairs: list[tuple[str, Any]]) -> dict:
+        return {self._keys.setdefault(key, key): value for key, value in pairs}
+
+    def feed(self, text: str, final: bool = False):
+        self._buffer += text
+        pos = _skip_whitespace(self._buffer, 0)
+        if self._rows is None:
+            if pos == len(self._buffer) or self._buffer[pos] != "[":
+                return
+            self._rows = []
+            pos += 1
+
+        while not self._done:
+            pos = _skip_whitespace(self._buffer, pos)
+            if pos == len(self._buffer):
+                break
+            char = self._buffer[pos]
+            if char == "]":
+                if self._expect_element and self._rows:
+                    raise ValueError("Trailing comma in JSON array.")
+                self._done = True
+                pos += 1
+            elif self._expect_element:
+                decoded = _decode_value(self._buffer, pos, final, self._decoder)
+                if decoded is None:
+                    break
+                row, pos = decoded
+                self._rows.append(row)
+                self._expect_element = False
+            elif char == ",":
+                self._expect_element = True
+                pos += 1
+            else:
+                raise ValueError(f"Unexpected character {char!r} in JSON array.")
+        # Drop consumed text so only the incomplete tail is kept in memory
+        self._buffer = self._buffer[pos:]
+
+    def close(self) -> Any:
+        if self._rows is None:
+            return json.loads(self._buffer)
+        self.feed("", final=True)
+        if not self._done or self._buffer.strip():
+            raise ValueError("Truncated or malformed JSON array in response body.")
+        return self._rows
+
+
+class LambdaPayloadParser:
+    """
+    Incrementally parses an API Gateway style Lambda response,
+    `{"statusCode": ..., "body": "<JSON string>"}`, without materializing the
+    payload or the nested body string. The body string is unescaped as it
+    arrives and fed straight into a `_BodyParser`.
+    """
+
+    def __init__(self):
+        self._carry = ""
+        self._state = "start"
+        self._key: str | None = None
+        self._values: dict[str, Any] = {}
+        self._body_parser: _BodyParser | None = None
+
+    def feed(self, text: str, final: bool = False):
+        text = self._carry + text
+        self._carry = ""
+        pos = 0
+        while pos < len(text) or self._state == "body_end":
+            if self._state == "body_string":
+                pos = self._feed_body_string(text, pos)
+                if self._state == "body_string":
+                    return
+                continue
+            if self._state == "body_end":
+                self._values["body"] = self._body_parser.close()
+                self._state = "after_value"
+                continue
+
+            pos = _skip_whitespace(text, pos)
+            if pos == len(text):
+                break
+            char = text[pos]
+
+            if self._state == "start":
+                if char != "{":
+                    raise ValueError("Lambda payload is not a JSON object.")
+                self._state = "key_or_end"
+                pos += 1
+            elif self._state in ("key_or_end", "key"):
+                if char == "}" and self._state == "key_or_end":
+                    self._state = "end"
+                    pos += 1
+                    continue
+                decoded = _decode_value(text, pos, final)
+                if decoded is None:
+                    break
+                self._key, pos = decoded
+                self._state = "colon"
+            elif self._state == "colon":
+                if char != ":":
+                    raise ValueError("Malformed Lambda payload: expected ':'.")
+                self._state = "value"
+                pos += 1
+            elif self._state == "value":
+                if self._key == "body" and char == '"':
+                    self._body_parser = _BodyParser()
+                    self._state = "body_string"
+                    pos += 1
+                    continue
+                decoded = _decode_value(text, pos, final)
+                if decoded is None:
+                    break
+                self._values[self._key], pos = decoded
+                self._state = "after_value"
+            elif self._state == "after_value":
+                if char == ",":
+                    self._state = "key"
+                elif char == "}":
+                    self._state = "end"
+                else:
+                    raise ValueError("Malformed Lambda payload: expected ',' or '}'.")
+                pos += 1
+            else:
+                raise ValueError("Unexpected data after the end of the Lambda payload.")
+        self._carry = text[pos:]
+
+    def _feed_body_string(self, text: str, pos: int) -> int:
+        """Unescapes the body string from `pos`, returning where it stopped."""
+        end = _STRING_CONTENT.match(text, pos).end()
+        closed = end < len(text) and text[end] == '"'
+        # An escape sequence split across chunks is finished with the next one
+        split_escape = not closed and len(text) - end < 6
+        if split_escape:
+            # Keep a trailing high surrogate until its low half arrives
+            tail = _HIGH_SURROGATE_TAIL.search(text, max(pos, end - 6), end)
+            if tail:
+                before = text[pos : tail.start()]
+                # An odd run of backslashes means the match is an escaped "\\"
+                if (len(before) - len(before.rstrip("\\"))) % 2 == 0:
+                    end = tail.start()
+        if end > pos:
+            # Let the C decoder unescape the whole segment in one call
+            self._body_parser.feed(json.loads(f'"{text[pos:end]}"'))
+
+        if closed:
+            self._state = "body_end"
+            return end + 1
+        if not split_escape:
+            raise ValueError(
+                f"Invalid escape sequence {text[end : end + 6]!r} in response body."
+            )
+        self._carry = text[end:]
+        return len(text)
+
+    def close(self) -> tuple[int | None, Any]:
+        """Returns the status code and parsed body once all input is fed."""
+        self.feed("", final=True)
+        if self._state != "end" or self._carry.strip():
+            raise ValueError("Truncated or malformed Lambda payload.")
+        return self._values.get("statusCode"), self._values.get("body", {})
+
+
+def read_lambda_payload(
+    stream,
+    max_bytes: int = DEFAULT_MAX_RESPONSE_BYTES,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> tuple[int | None, Any]:
+    """
+    Reads a boto3 `StreamingBody` in chunks, enforcing a byte budget and
+    parsing the payload as it arrives.
+
+    Returns:
+        The Lambda response's status code and its parsed body.
+
+    Raises:
+        PayloadTooLargeError: As soon as more than `max_bytes` have been read.
+        ValueError: If the payload is not valid JSON.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parser = LambdaPayloadParser()
+    total = 0
+    try:
+        for chunk in stream.iter_chunks(chunk_size):
+            total += len(chunk)
+            if total > max_bytes:
+                raise PayloadTooLargeError(
+                    f"Response exceeded the limit of {max_bytes:,} bytes."
+                )
+            parser.feed(decoder.decode(chunk))
+        parser.feed(decoder.decode(b"", final=True))
+    finally:
+        stream.close()
+    return parser.close()
@@ -0,0 +1,175 @@
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+# Popularity scores below this are forgotten when decayed
+MIN_POPULARITY = 0.05
+
+
+def normalize_question(question: str) -> str:
+    return re.sub(r"\s+", " ", question).strip().casefold()
+
+
+def normalize_sql(sql_query: str) -> str:
+    return re.sub(r"\s+", " ", sql_query).strip().rstrip(";")
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximates the memory held by a cached value by its JSON size."""
+    return len(json.dumps(value, default=str))
+
+
+class QueryCache:
+    """
+    Thread-safe cache of AI responses (keyed by question) and pre-warmed
+    Flexline results (keyed by SQL), bounded by an estimated size in bytes and
+    evicted least recently used first. It also keeps popularity scores for
+    each question and SQL query so the most requested ones can be pre-warmed.
+
+    AI responses are tied to the workspace version (its `updated_at`) they
+    were generated against and are dropped once the version changes.
+    """
+
+    def __init__(
+        self,
+        sql_ttl_seconds: float = 24 * 3600,
+        results_ttl_seconds: float = 6 * 3600,
+        max_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.sql_ttl_seconds = sql_ttl_seconds
+        self.results_ttl_seconds = results_ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # (kind, key) -> (stored_at, size, value), kept in least-recently-used order
+        self._entries: OrderedDict[tuple[str, str], tuple[float, int, Any]] = (
+            OrderedDict()
+        )
+        self._size = 0
+        self._workspace_version: str | None = None
+        self._popularity: dict[str, dict[str, float]] = {"sql": {}, "results": {}}
+        # Original (non-normalized) text for each popularity key
+        self._originals: dict[tuple[str, str], str] = {}
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _ttl(self, kind: str) -> float:
+        return self.sql_ttl_seconds if kind == "sql" else self.results_ttl_seconds
+
+    def _remove(self, entry_key: tuple[str, str]):
+        _, size, _ = self._entries.pop(entry_key)
+        self._size -= size
+
+    def _get(self, kind: str, key: str) -> tuple[float, Any] | None:
+        with self._lock:
+            entry = self._entries.get((kind, key))
+            if entry is None:
+                return None
+            stored_at, _, value = entry
+            if time.time() - stored_at > self._ttl(kind):
+                self._remove((kind, key))
+                return None
+            self._entries.move_to_end((kind, key))
+            return stored_at, value
+
+    def _put(self, kind: str, key: str, value: Any):
+        size = _estimate_size(value)
+        with self._lock:
+            if (kind, key) in self._entries:
+                self._remove((kind, key))
+            if size > self.max_bytes:
+                return
+            self._entries[(kind, key)] = (time.time(), size, value)
+            self._size += size
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _record(self, kind: str, key: str, original: str):
+        with self._lock:
+            scores = self._popularity[kind]
+            scores[key] = scores.get(key, 0.0) + 1.0
+            self._originals[(kind, key)] = original
+
+    def _top(self, kind: str, n: int) -> list[str]:
+        with self._lock:
+            scores = self._popularity[kind]
+            keys = sorted(scores, key=scores.get, reverse=True)[:n]
+            return [self._originals[(kind, key)] for key in keys]
+
+    # --- AI responses, keyed by question ---
+
+    def set_workspace_version(self, updated_at: str | None):
+        """
+        Records the workspace's current `updated_at`, dropping AI responses
+        generated against any other version.
+        """
+        with self._lock:
+            if updated_at == self._workspace_version:
+                return
+            self._workspace_version = updated_at
+            for entry_key, (_, _, value) in list(self._entries.items()):
+                if entry_key[0] == "sql" and value[0] != updated_at:
+                    self._remove(entry_key)
+
+    def get_sql(self, question: str) -> dict | None:
+        entry = self._get("sql", normalize_question(question))
+        if entry is None:
+            return None
+        version, response = entry[1]
+        return response if version == self._workspace_version else None
+
+    def put_sql(self, question: str, response: dict):
+        self._put(
+            "sql", normalize_question(question), (self._workspace_version, response)
+        )
+
+    def has_sql(self, question: str) -> bool:
+        return self.get_sql(question) is not None
+
+    def record_question(self, question: str):
+        self._record("sql", normalize_question(question), question)
+
+    def top_questions(self, n: int) -> list[str]:
+        return self._top("sql", n)
+
+    # --- Pre-warmed Flexline results, keyed by SQL ---
+
+    def get_results(self, sql_query: str) -> list[dict] | None:
+        entry = self._get("results", normalize_sql(sql_query))
+        return entry[1] if entry else None
+
+    def put_results(self, sql_query: str, results: list[dict]):
+        self._put("results", normalize_sql(sql_query), results)
+
+    def results_cached_at(self, sql_query: str) -> float | None:
+        """Returns when the cached results were stored, as a Unix timestamp."""
+        entry = self._get("results", normalize_sql(sql_query))
+        return entry[0] if entry else None
+
+    def results_age(self, sql_query: str) -> float | None:
+        """Returns the age in seconds of the cached results, if any."""
+        cached_at = self.results_cached_at(sql_query)
+        return time.time() - cached_at if cached_at is not None else None
+
+    def record_sql(self, sql_query: str):
+        self._record("results", normalize_sql(sql_query), sql_query)
+
+    def top_sql(self, n: int) -> list[str]:
+        return self._top("results", n)
+
+    def decay_popularity(self, factor: float = 0.5):
+        """
+        Scales all popularity scores down so recent usage outweighs old usage.
+        Scores that drop below `MIN_POPULARITY` are forgotten.
+        """
+        with self._lock:
+            for kind, scores in self._popularity.items():
+                for key in list(scores):
+                    scores[key] *= factor
+                    if scores[key] < MIN_POPULARITY:
+                        del scores[key]
+                        self._originals.pop((kind, key), None)
@@ -0,0 +1,192 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+from app.flexline.client import FlexlineClient, FlexlineError
+from app.text2sql.client import Text2SQLClient
+
+from .cache import QueryCache
+
+logger = logging.getLogger(__name__)
+
+
+class PrewarmScheduler:
+    """
+    Periodically refreshes the most popular questions and SQL queries in a
+    `QueryCache` from a background thread, only during an off-peak window.
+
+    The clients passed in should not have the cache attached themselves, so
+    that warming neither reads stale entries nor counts as popularity. With
+    `credentials` (username, password) the scheduler logs the Text2SQL client
+    in by itself whenever it has no valid token.
+    """
+
+    def __init__(
+        self,
+        text2sql_client: Text2SQLClient,
+        flexline_client: FlexlineClient,
+        cache: QueryCache,
+        top_n: int = 20,
+        interval_seconds: float = 900,
+        window_start_hour: int = 5,
+        window_end_hour: int = 7,
+        max_workers: int = 2,
+        flexline_concurrency: int = 1,
+        min_query_interval_seconds: float = 2.0,
+        results_refresh_after_seconds: float = 3600,
+        daily_decay: float = 0.5,
+        credentials: tuple[str, str] | None = None,
+    ):
+        self.text2sql_client = text2sql_client
+        self.flexline_client = flexline_client
+        self.cache = cache
+        self.top_n = top_n
+        self.interval_seconds = interval_seconds
+        self.window_start_hour = window_start_hour
+        self.window_end_hour = window_end_hour
+        self.max_workers = max_workers
+        self.min_query_interval_seconds = min_query_interval_seconds
+        self.results_refresh_after_seconds = results_refresh_after_seconds
+        self.daily_decay = daily_decay
+        self.credentials = credentials
+        self._flexline_slots = threading.BoundedSemaphore(flexline_concurrency)
+        self._rate_lock = threading.Lock()
+        self._last_query_started = 0.0
+        self._last_updated_at = None
+        self._last_decay_date: date | None = None
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def in_window(self, now: datetime | None = None) -> bool:
+        """Checks whether `now` is in the off-peak window (which may wrap midnight)."""
+        hour = (now or datetime.now()).hour
+        if self.window_start_hour <= self.window_end_hour:
+            return self.window_start_hour <= hour < self.window_end_hour
+        return hour >= self.window_start_hour or hour < self.window_end_hour
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="prewarm-scheduler", daemon=True
+        )
+        self._thread.start()
+        logger.info("Pre-warm scheduler started.")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+
+    def _loop(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            if not self.in_window():
+                continue
+            try:
+                self.warm_once()
+            except Exception:
+                logger.exception("Pre-warm cycle failed.")
+
+    def _authenticate(self) -> bool:
+        if self.credentials:
+            authenticated = self.text2sql_client.authenticate(*self.credentials)
+        else:
+            authenticated = self.text2sql_client.reauthenticate()
+        if not authenticated:
+            logger.warning(
+                "Pre-warm scheduler could not authenticate with the SaaS API."
+            )
+        return authenticated
+
+    def _get_workspace_details(self) -> dict | None:
+        if not self.text2sql_client.token and not self._authenticate():
+            return None
+        details = self.text2sql_client.get_workspace_details()
+        if details is None and self._authenticate():
+            # The token has most likely expired since the previous cycle
+            details = self.text2sql_client.get_workspace_details()
+        return details
+
+    def warm_once(self):
+        """Runs a single warm cycle: AI responses first, then query results."""
+        top_questions = self.cache.top_questions(self.top_n)
+        questions = []
+        details = self._get_workspace_details()
+        if details is None:
+            logger.warning(
+                "Could not fetch workspace details; skipping SQL generation this cycle."
+            )
+        else:
+            updated_at = details.get("updated_at")
+            self.cache.set_workspace_version(updated_at)
+            questions = top_questions
+            if updated_at is not None and updated_at == self._last_updated_at:
+                # The workspace is unchanged, so previously generated SQL is still valid
+                questions = [q for q in questions if not self.cache.has_sql(q)]
+            self._last_updated_at = updated_at
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            warmed_questions = sum(
+                r is not None for r in executor.map(self._warm_question, questions)
+            )
+
+            question_sql = [
+                response["sql_query"]
+                for response in map(self.cache.get_sql, top_questions)
+                if response and response.get("sql_query")
+            ]
+            sql_queries = [
+                sql
+                for sql in dict.fromkeys(self.cache.top_sql(self.top_n) + question_sql)
+                if self._results_stale(sql)
+            ]
+            warmed_results = sum(executor.map(self._warm_results, sql_queries))
+
+        self._decay_daily()
+        logger.info(
+            f"Pre-warm cycle finished: {warmed_questions}/{len(questions)} questions, "
+            f"{warmed_results}/{len(sql_queries)} result sets refreshed."
+        )
+
+    def _decay_daily(self, today: date | None = None):
+        """Decays popularity once per elapsed day rather than on every cycle."""
+        today = today or date.today()
+        if self._last_decay_date is not None:
+            days = (today - self._last_decay_date).days
+            if days <= 0:
+                return
+            self.cache.decay_popularity(self.daily_decay**days)
+        self._last_decay_date = today
+
+    def _results_stale(self, sql_query: str) -> bool:
+        age = self.cache.results_age(sql_query)
+        return age is None or age > self.results_refresh_after_seconds
+
+    def _warm_question(self, question: str) -> dict | None:
+        response = self.text2sql_client.get_sql(question)
+        if response:
+            self.cache.put_sql(question, response)
+        return response
+
+    def _wait_for_query_slot(self):
+        """Spaces out query starts to limit the load on the database."""
+        with self._rate_lock:
+            next_start = self._last_query_started + self.min_query_interval_seconds
+            wait = next_start - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_query_started = time.monotonic()
+
+    def _warm_results(self, sql_query: str) -> bool:
+        with self._flexline_slots:
+            self._wait_for_query_slot()
+            try:
+                results = self.flexline_client.run(sql_query)
+            except FlexlineError as e:
+                logger.warning(f"Failed to pre-warm query results: {e}")
+                return False
+        self.cache.put_results(sql_query, results)
+        return True
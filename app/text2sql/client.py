@@ -1,16 +1,23 @@
+import json
 import logging
+from collections.abc import Iterator
 
 import requests
 
+from app.prewarm.cache import QueryCache
+
 # Configure logger
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 class Text2SQLClient:
-    def __init__(self, base_url: str, workspace_id: str):
+    def __init__(
+        self, base_url: str, workspace_id: str, cache: QueryCache | None = None
+    ):
         self.base_url = base_url
         self.workspace_id = workspace_id
+        self.cache = cache
         # Credentials and token will be stored here
         self._username = None
         self._password = None
@@ -38,6 +45,12 @@ class Text2SQLClient:
             logger.error(f"Failed to authenticate with SaaS API: {e}")
             return False
 
+    def reauthenticate(self) -> bool:
+        """Renews the token using the credentials stored by `authenticate`."""
+        if not self._username:
+            return False
+        return self.authenticate(self._username, self._password)
+
     def get_workspace_details(self) -> dict | None:
         """Fetches details for the configured workspace."""
         if not self.token:
@@ -72,42 +85,139 @@ class Text2SQLClient:
             logger.error(f"Failed to get user details: {e}")
             return None
 
-    def get_sql(self, question: str) -> dict | None:
+    def get_sql(self, question: str, use_cache: bool = True) -> dict | None:
         """
         Calls the AI service to get the SQL query.
         Handles token expiration and re-authentication automatically.
+        Responses pre-warmed into the cache are returned directly unless
+        `use_cache` is False; other responses are not cached.
+        """
+        if self.cache:
+            self.cache.record_question(question)
+            cached = self.cache.get_sql(question) if use_cache else None
+            if cached:
+                logger.info("Serving AI response from cache.")
+                return cached
+
+        response = self._request_with_reauth(question)
+
+        # --- Process Final Response ---
+        if response and response.ok:
+            return self._accept_response(response.json())
+        elif response:
+            logger.error(
+                f"API request failed with status {response.status_code}: {response.text}"
+            )
+
+        return None
+
+    def get_sql_stream(
+        self, question: str, use_cache: bool = True
+    ) -> Iterator[dict]:
         """
+        Streaming variant of `get_sql` that consumes a server-sent events
+        response and yields events as they arrive:
+
+          {"type": "sql", "text": ...}          partial SQL tokens
+          {"type": "explanation", "text": ...}  partial explanation tokens
+          {"type": "final", "data": ...}        the full payload, or None if it
+                                                failed or is not read-only
+
+        The "final" event is always the last one. If the server answers with
+        plain JSON instead of a stream, only the "final" event is yielded.
+        The cache is used as in `get_sql`.
+        """
+        if self.cache:
+            self.cache.record_question(question)
+            cached = self.cache.get_sql(question) if use_cache else None
+            if cached:
+                logger.info("Serving AI response from cache.")
+                yield {"type": "final", "data": cached}
+                return
+
+        response = self._request_with_reauth(question, stream=True)
+        if not response or not response.ok:
+            if response:
+                logger.error(
+                    f"API request failed with status {response.status_code}: {response.text}"
+                )
+            yield {"type": "final", "data": None}
+            return
+
+        data = None
+        with response:
+            try:
+                if not response.headers.get("Content-Type", "").startswith(
+                    "text/event-stream"
+                ):
+                    data = response.json()
+                else:
+                    for event, payload in _iter_sse_events(response):
+                        if not isinstance(payload, dict):
+                            logger.error(
+                                f"AI service sent a malformed '{event}' event: {payload!r}"
+                            )
+                            break
+                        if event in ("sql", "explanation"):
+                            text = payload.get("text", "")
+                            if not isinstance(text, str):
+                                logger.error(
+                                    f"AI service sent non-text '{event}' tokens: {text!r}"
+                                )
+                                break
+                            yield {"type": event, "text": text}
+                        elif event == "done":
+                            data = payload
+                            break
+                        elif event == "error":
+                            logger.error(f"AI service reported an error: {payload}")
+                            break
+            except (requests.exceptions.RequestException, ValueError) as e:
+                # requests' and json's decode errors are both ValueErrors
+                logger.error(f"Failed to read SQL response from AI service: {e}")
+
+        if data is None:
+            logger.error("SQL stream ended without a final payload.")
+            yield {"type": "final", "data": None}
+        else:
+            yield {"type": "final", "data": self._accept_response(data)}
+
+    def _accept_response(self, data: dict) -> dict | None:
+        """Rejects malformed payloads and queries not flagged as read-only."""
+        if not isinstance(data, dict):
+            logger.error(f"API returned a malformed response: {data!r}")
+            return None
+        if not data.get("read_only"):
+            logger.warning(
+                "API returned a query that is not flagged as read-only. Rejecting."
+            )
+            return None
+        return data
+
+    def _request_with_reauth(
+        self, question: str, stream: bool = False
+    ) -> requests.Response | None:
+        """Makes the AI request, re-authenticating once if the token expired."""
         # --- First Attempt ---
-        response = self._make_request(question)
+        response = self._make_request(question, stream=stream)
 
         # --- Handle Expired Token and Retry ---
         if response and response.status_code == 401:
+            response.close()
             logger.info("Token expired or invalid. Attempting to re-authenticate...")
-            if self.authenticate(self._username, self._password):
+            if self.reauthenticate():
                 logger.info("Re-authentication successful. Retrying the request...")
                 # --- Second Attempt ---
-                response = self._make_request(question)
+                response = self._make_request(question, stream=stream)
             else:
                 logger.error("Re-authentication failed. Cannot proceed.")
                 return None
 
-        # --- Process Final Response ---
-        if response and response.ok:
-            data = response.json()
-            if not data.get("read_only"):
-                logger.warning(
-                    "API returned a query that is not flagged as read-only. Rejecting."
-                )
-                return None
-            return data
-        elif response:
-            logger.error(
-                f"API request failed with status {response.status_code}: {response.text}"
-            )
+        return response
 
-        return None
-
-    def _make_request(self, question: str) -> requests.Response | None:
+    def _make_request(
+        self, question: str, stream: bool = False
+    ) -> requests.Response | None:
         """Helper method to make the actual API request."""
         if not self.token:
             logger.error("Authentication token not found.")
@@ -115,10 +225,35 @@ class Text2SQLClient:
 
         ai_url = f"{self.base_url}/api/ai/{self.workspace_id}"
         headers = {"Authorization": f"Bearer {self.token}"}
+        if stream:
+            headers["Accept"] = "text/event-stream"
         params = {"question": question}
         try:
             # We don't raise for status here, so we can handle 401s manually
-            return requests.get(ai_url, headers=headers, params=params)
+            return requests.get(ai_url, headers=headers, params=params, stream=stream)
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to get SQL from AI service: {e}")
             return None
+
+
+def _iter_sse_events(response: requests.Response) -> Iterator[tuple[str, dict]]:
+    """Parses a server-sent events response into (event, JSON data) pairs."""
+    # Server-sent events are always UTF-8, whatever the Content-Type says
+    response.encoding = "utf-8"
+    event, data_lines = "message", []
+    # chunk_size=None yields data as it arrives instead of waiting for a full chunk
+    for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+        if line:
+            field, _, value = line.partition(":")
+            value = value.removeprefix(" ")
+            if field == "event":
+                event = value
+            elif field == "data":
+                data_lines.append(value)
+            continue
+        # A blank line dispatches the event collected so far
+        if data_lines:
+            yield event, json.loads("\n".join(data_lines))
+        event, data_lines = "message", []
+    if data_lines:
+        yield event, json.loads("\n".join(data_lines))
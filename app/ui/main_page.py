@@ -1,8 +1,43 @@
+from datetime import datetime, timezone
+
 import pandas as pd
 import streamlit as st
 
 from app.flexline.client import FlexlineError
 from app.flexline.utils import generate_count_query
+from app.ui.utils import format_timestamp
+
+
+def stream_ai_response(
+    text2sql_client, question: str, use_cache: bool = True
+) -> dict | None:
+    """
+    Renders the SQL and explanation tokens as the AI streams them, then
+    clears the draft and returns the final payload (None if rejected).
+    """
+    status = st.empty()
+    explanation_placeholder = st.empty()
+    sql_placeholder = st.empty()
+    status.caption("Asking the AI... 🧠")
+
+    sql_query, explanation = "", ""
+    response = None
+    for event in text2sql_client.get_sql_stream(question, use_cache=use_cache):
+        if event["type"] == "sql":
+            sql_query += event["text"]
+            sql_placeholder.code(sql_query, language="sql")
+        elif event["type"] == "explanation":
+            explanation += event["text"]
+            explanation_placeholder.info(f"**Explanation:** {explanation}")
+        else:
+            response = event["data"]
+
+    # The reviewed query is rendered in Step 2 once the final payload is in
+    status.empty()
+    explanation_placeholder.empty()
+    sql_placeholder.empty()
+    return response
+
 
 def main_page(text2sql_client, flexline_client):
     """Renders the main application page for generating and executing SQL queries."""
@@ -21,13 +56,16 @@ def main_page(text2sql_client, flexline_client):
 
     if generate_button and question:
         st.session_state.results_df = None  # Clear previous results
-        with st.spinner("Asking the AI... 🧠"):
-            response = text2sql_client.get_sql(question)
-            st.session_state.ai_response = response or None
-            if not response:
-                st.error(
-                    "Failed to get a valid response from the AI. The query might not be read-only or the API may be down."
-                )
+        st.session_state.results_cached_at = None
+        # Asking the same question again means the user wants a fresh answer
+        use_cache = question != st.session_state.get("last_question")
+        st.session_state.last_question = question
+        response = stream_ai_response(text2sql_client, question, use_cache=use_cache)
+        st.session_state.ai_response = response or None
+        if not response:
+            st.error(
+                "Failed to get a valid response from the AI. The query might not be read-only or the API may be down."
+            )
 
     if st.session_state.ai_response:
         st.divider()
@@ -43,13 +81,29 @@ def main_page(text2sql_client, flexline_client):
             "✅ The generated query is flagged as **read-only** and is safe to run."
         )
 
+        cache = flexline_client.cache
+        cached_at = cache.results_cached_at(sql_query) if cache else None
+        use_cache = False
+        if cached_at:
+            cached_at_label = format_timestamp(
+                datetime.fromtimestamp(cached_at, timezone.utc).isoformat()
+            )
+            use_cache = st.checkbox(
+                f"Use pre-warmed results from {cached_at_label}",
+                value=True,
+                help="Uncheck to run the query against the database now.",
+            )
+
         if st.button("Run Query and Get Results", type="primary"):
             MAX_RECORDS = 10000
+            st.session_state.results_cached_at = cached_at if use_cache else None
 
             with st.spinner("Checking query size... ⚙️"):
                 try:
                     final_count_query = generate_count_query(sql_query)
-                    count_results = flexline_client.run(final_count_query)
+                    count_results = flexline_client.run(
+                        final_count_query, use_cache=use_cache
+                    )
 
                     record_count = 0
                     if (
@@ -69,7 +123,9 @@ def main_page(text2sql_client, flexline_client):
                             f"Query will return {record_count:,} records. Fetching data..."
                         )
                         with st.spinner("Executing query... ⚙️"):
-                            results = flexline_client.run(sql_query)
+                            results = flexline_client.run(
+                                sql_query, use_cache=use_cache
+                            )
                             st.success("✅ Query executed successfully!")
 
                             if isinstance(results, list) and results:
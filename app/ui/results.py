@@ -1,13 +1,24 @@
 import io
+from datetime import datetime, timezone
 
 import pandas as pd
 import streamlit as st
 
+from app.ui.utils import format_timestamp
+
 def display_results():
     """Displays the results dataframe and provides export options."""
     if st.session_state.results_df is not None:
         st.divider()
         st.header("Step 3: Results")
+        if st.session_state.get("results_cached_at"):
+            cached_at = datetime.fromtimestamp(
+                st.session_state.results_cached_at, timezone.utc
+            ).isoformat()
+            st.caption(
+                f"⏱️ Pre-warmed results cached at {format_timestamp(cached_at)}; "
+                "the data may have changed since."
+            )
 
         # Display the formatted DataFrame
         formatted_df = st.session_state.results_df.copy()
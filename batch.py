@@ -0,0 +1,112 @@
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+
+from app.batch.runner import BatchRunner, load_items
+from app.batch.writers import get_writer
+from app.flexline.client import FlexlineClient
+from app.text2sql.client import Text2SQLClient
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run a file of questions (or SQL) through the AI and Flexline."
+    )
+    parser.add_argument(
+        "input", help="Questions file (.txt, one per line) or .jsonl records."
+    )
+    parser.add_argument(
+        "output",
+        help="Results file (.jsonl, .csv) or .parquet directory of part files.",
+    )
+    parser.add_argument(
+        "--sql",
+        action="store_true",
+        help="Treat each input line as SQL and skip SQL generation.",
+    )
+    parser.add_argument(
+        "--sql-only",
+        action="store_true",
+        help="Only generate SQL, without executing it against Flexline.",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Re-run items that failed in a previous run instead of skipping them.",
+    )
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--text2sql-concurrency", type=int, default=4)
+    parser.add_argument("--flexline-concurrency", type=int, default=2)
+    return parser.parse_args()
+
+
+def init_text2sql_client() -> Text2SQLClient:
+    client = Text2SQLClient(
+        base_url=os.environ["SaaS_API_BASE_URL"],
+        workspace_id=os.environ["WORKSPACE_ID"],
+    )
+    if not client.authenticate(
+        os.environ["SaaS_API_USERNAME"], os.environ["SaaS_API_PASSWORD"]
+    ):
+        raise RuntimeError("Authentication with the SaaS API failed.")
+    return client
+
+
+def init_flexline_client() -> FlexlineClient:
+    return FlexlineClient(
+        aws_access_key_id=os.environ["FLEXLINE_AWS_ACCESS_KEY_ID"],
+        aws_secret_access_key=os.environ["FLEXLINE_AWS_SECRET_ACCESS_KEY"],
+        api_key=os.environ["FLEXLINE_API_KEY"],
+        username=os.environ["FLEXLINE_USERNAME"],
+        password=os.environ["FLEXLINE_PASSWORD"],
+    )
+
+
+def main() -> int:
+    args = parse_args()
+    if args.sql and args.sql_only:
+        print("🚨 --sql and --sql-only cannot be combined.")
+        return 2
+
+    try:
+        items = load_items(args.input, as_sql=args.sql)
+    except OSError as e:
+        print(f"🚨 Could not read the input file: {e}")
+        return 2
+    except ValueError as e:
+        print(f"🚨 {e}")
+        return 2
+
+    load_dotenv()
+    try:
+        text2sql_client = None if args.sql else init_text2sql_client()
+        flexline_client = None if args.sql_only else init_flexline_client()
+    except KeyError as e:
+        print(f"🚨 Configuration Error: Missing required environment variable {e}.")
+        return 1
+    except RuntimeError as e:
+        print(f"🚨 {e}")
+        return 1
+
+    try:
+        writer = get_writer(args.output)
+    except ValueError as e:
+        print(f"🚨 {e}")
+        return 2
+
+    runner = BatchRunner(
+        text2sql_client,
+        flexline_client,
+        max_workers=args.workers,
+        text2sql_concurrency=args.text2sql_concurrency,
+        flexline_concurrency=args.flexline_concurrency,
+    )
+    summary = runner.run(items, writer, retry_failed=args.retry_failed)
+    print(summary.format())
+    return 0 if not summary.failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,9 @@ import streamlit as st
 import toml
 
 from app.flexline.client import FlexlineClient
+from app.flexline.payload import DEFAULT_MAX_RESPONSE_BYTES
+from app.prewarm.cache import QueryCache
+from app.prewarm.scheduler import PrewarmScheduler
 from app.text2sql.client import Text2SQLClient
 from app.ui.authentication import check_password
 from app.ui.main_page import main_page
@@ -30,21 +33,68 @@ if not check_password():
     st.stop()
 
 
+def authenticate_with_backend(_client):
+    """Authenticates the client with the backend API."""
+    return _client.authenticate(
+        username=st.secrets.saas_api.username, password=st.secrets.saas_api.password
+    )
+
+
+def create_clients(cache=None):
+    """Creates Text2SQL and Flexline clients from the configured secrets."""
+    text2sql_client = Text2SQLClient(
+        base_url=st.secrets.saas_api.base_url,
+        workspace_id=st.secrets.saas_api.workspace_id,
+        cache=cache,
+    )
+    flexline_client = FlexlineClient(
+        aws_access_key_id=st.secrets.flexline_lambda.aws_access_key_id,
+        aws_secret_access_key=st.secrets.flexline_lambda.aws_secret_access_key,
+        api_key=st.secrets.flexline_lambda.api_key,
+        username=st.secrets.flexline_lambda.username,
+        password=st.secrets.flexline_lambda.password,
+        cache=cache,
+        max_response_bytes=st.secrets.flexline_lambda.get(
+            "max_response_bytes", DEFAULT_MAX_RESPONSE_BYTES
+        ),
+    )
+    return text2sql_client, flexline_client
+
+
+@st.cache_resource
+def get_prewarm_scheduler():
+    """Creates the process-wide query cache and starts its pre-warm scheduler."""
+    config = st.secrets.get("prewarm", {})
+    cache = QueryCache(
+        sql_ttl_seconds=config.get("sql_ttl_seconds", 24 * 3600),
+        results_ttl_seconds=config.get("results_ttl_seconds", 6 * 3600),
+        max_bytes=config.get("max_cache_bytes", 64 * 1024 * 1024),
+    )
+    # The scheduler uses its own clients without the cache attached
+    text2sql_client, flexline_client = create_clients()
+    scheduler = PrewarmScheduler(
+        text2sql_client,
+        flexline_client,
+        cache,
+        top_n=config.get("top_n", 20),
+        interval_seconds=config.get("interval_seconds", 900),
+        window_start_hour=config.get("window_start_hour", 5),
+        window_end_hour=config.get("window_end_hour", 7),
+        max_workers=config.get("max_workers", 2),
+        flexline_concurrency=config.get("flexline_concurrency", 1),
+        min_query_interval_seconds=config.get("min_query_interval_seconds", 2.0),
+        # The scheduler logs in on its own, so a failed login now is retried later
+        credentials=(st.secrets.saas_api.username, st.secrets.saas_api.password),
+    )
+    if config.get("enabled", True):
+        scheduler.start()
+    return scheduler
+
+
 def init_clients():
     """Initializes and returns both Text2SQL and Flexline clients."""
     try:
-        text2sql_client = Text2SQLClient(
-            base_url=st.secrets.saas_api.base_url,
-            workspace_id=st.secrets.saas_api.workspace_id,
-        )
-        flexline_client = FlexlineClient(
-            aws_access_key_id=st.secrets.flexline_lambda.aws_access_key_id,
-            aws_secret_access_key=st.secrets.flexline_lambda.aws_secret_access_key,
-            api_key=st.secrets.flexline_lambda.api_key,
-            username=st.secrets.flexline_lambda.username,
-            password=st.secrets.flexline_lambda.password,
-        )
-        return text2sql_client, flexline_client
+        return create_clients(cache=get_prewarm_scheduler().cache)
     except (AttributeError, KeyError) as e:
         st.error(
             f"🚨 Critical Error: Secrets are not configured correctly. Missing key: {e}"
@@ -55,13 +105,6 @@ def init_clients():
 text2sql_client, flexline_client = init_clients()
 
 
-def authenticate_with_backend(_client):
-    """Authenticates the client with the backend API."""
-    return _client.authenticate(
-        username=st.secrets.saas_api.username, password=st.secrets.saas_api.password
-    )
-
-
 if not authenticate_with_backend(text2sql_client):
     st.error("Backend authentication failed. Please check API credentials and status.")
     st.stop()
@@ -70,6 +113,11 @@ APP_VERSION = get_project_version()
 
 if "workspace_details" not in st.session_state or st.session_state.workspace_details is None:
     st.session_state.workspace_details = text2sql_client.get_workspace_details()
+    if st.session_state.workspace_details is not None:
+        # Drop cached AI responses generated against an older workspace version
+        text2sql_client.cache.set_workspace_version(
+            st.session_state.workspace_details.get("updated_at")
+        )
 
 if "user_email" not in st.session_state or st.session_state.user_email is None:
     user_details = text2sql_client.get_user_me()
@@ -91,6 +139,8 @@ if "ai_response" not in st.session_state:
     st.session_state.ai_response = None
 if "results_df" not in st.session_state:
     st.session_state.results_df = None
+if "results_cached_at" not in st.session_state:
+    st.session_state.results_cached_at = None
 
 main_page(text2sql_client, flexline_client)
 display_results()
\ No newline at end of file
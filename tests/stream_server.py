@@ -0,0 +1,121 @@
+import json
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# A canned AI response, streamed token by token to imitate the LLM
+SQL_QUERY = (
+    "SELECT TOP 5 producto, SUM(cantidad) AS total_vendido "
+    "FROM flexline.vista_venta_detalle "
+    "WHERE fecha >= dateadd(YEAR, -1, getdate()) "
+    "GROUP BY producto ORDER BY total_vendido DESC"
+)
+EXPLANATION = (
+    "This query sums the quantity sold per product over the last year "
+    "and returns the five products with the highest totals."
+)
+TOKEN_DELAY = 0.05
+
+# Questions that make the server answer with a malformed body instead
+MALFORMED_RESPONSES = {
+    "non-object token": ("text/event-stream", 'event: sql\ndata: "SELECT"\n\n'),
+    "non-object done": ("text/event-stream", 'event: done\ndata: ["SELECT 1"]\n\n'),
+    "malformed json": ("application/json", "{not json"),
+}
+
+
+def tokenize(text: str) -> list[str]:
+    words = text.split(" ")
+    return [word + " " for word in words[:-1]] + words[-1:]
+
+
+class StreamingAIHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the SaaS API's auth and AI endpoints."""
+
+    # HTTP/1.1 so the stream can use chunked transfer encoding like the real API
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload: dict, status: int = 200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_event(self, event: str, payload: dict):
+        self._send_chunk(f"event: {event}\ndata: {json.dumps(payload)}\n\n".encode())
+
+    def do_POST(self):
+        if self.path == "/api/auth/token":
+            self._send_json({"access_token": "local-token"})
+        else:
+            self._send_json({"detail": "Not found"}, status=404)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if not url.path.startswith("/api/ai/"):
+            self._send_json({"detail": "Not found"}, status=404)
+            return
+        if self.headers.get("Authorization") != "Bearer local-token":
+            self._send_json({"detail": "Not authenticated"}, status=401)
+            return
+
+        question = parse_qs(url.query).get("question", [""])[0]
+        if question in MALFORMED_RESPONSES:
+            content_type, body = MALFORMED_RESPONSES[question]
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body.encode())))
+            self.end_headers()
+            self.wfile.write(body.encode())
+            return
+
+        final = {
+            "question": question,
+            "sql_query": SQL_QUERY,
+            "explanation": EXPLANATION,
+            "read_only": True,
+        }
+        sql_tokens = tokenize(SQL_QUERY)
+        explanation_tokens = tokenize(EXPLANATION)
+
+        if "text/event-stream" not in self.headers.get("Accept", ""):
+            time.sleep(TOKEN_DELAY * (len(sql_tokens) + len(explanation_tokens)))
+            self._send_json(final)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for token in sql_tokens:
+            time.sleep(TOKEN_DELAY)
+            self._send_event("sql", {"text": token})
+        for token in explanation_tokens:
+            time.sleep(TOKEN_DELAY)
+            self._send_event("explanation", {"text": token})
+        self._send_event("done", final)
+        self._send_chunk(b"")
+
+
+def create_server(port: int = 0) -> ThreadingHTTPServer:
+    """Creates the stand-in server; port 0 picks a free port."""
+    return ThreadingHTTPServer(("127.0.0.1", port), StreamingAIHandler)
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    server = create_server(port)
+    print(f"Streaming stand-in server listening on http://127.0.0.1:{port}")
+    print("Point SaaS_API_BASE_URL at it to try the app without the real API.")
+    server.serve_forever()
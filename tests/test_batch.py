@@ -0,0 +1,147 @@
+import os
+import shutil
+import sys
+import tempfile
+
+# We need to adjust the path to import from the app directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.batch.runner import BatchRunner, load_items
+from app.batch.writers import JsonlWriter, ParquetWriter, get_writer
+
+
+class FakeText2SQLClient:
+    """Answers every question except those containing 'bad'."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_sql(self, question: str) -> dict | None:
+        self.calls += 1
+        if "bad" in question:
+            return None
+        return {"sql_query": f"SELECT '{question}'", "read_only": True}
+
+
+class FakeFlexlineClient:
+    """Returns enough rows that each result's `rows` JSON is over 128 KB."""
+
+    def run(self, sql_query: str) -> list[dict]:
+        return [{"producto": f"P-{i}", "cantidad": i} for i in range(8000)]
+
+
+class FailingWriter(JsonlWriter):
+    def write(self, result):
+        raise OSError("Disk full")
+
+
+def check(condition: bool, message: str) -> bool:
+    print(f"{'✅' if condition else '🚨 TEST FAILED:'} {message}")
+    return condition
+
+
+def run_batch(path: str, questions_path: str, retry_failed: bool = False):
+    text2sql_client = FakeText2SQLClient()
+    runner = BatchRunner(text2sql_client, FakeFlexlineClient(), max_workers=2)
+    summary = runner.run(
+        load_items(questions_path), get_writer(path), retry_failed=retry_failed
+    )
+    return summary, text2sql_client.calls
+
+
+def run_batch_test():
+    """
+    Exercises item loading, the runner's skip-on-resume and retry rules for
+    every output format, and the writers' edge cases, using fake clients.
+    """
+    print("--- Starting Batch Runner Test ---")
+    results = []
+    tmp_dir = tempfile.mkdtemp()
+
+    # 1. Loading items
+    questions_path = os.path.join(tmp_dir, "questions.txt")
+    with open(questions_path, "w", encoding="utf-8") as f:
+        f.write("top products\n# a comment\n\nsales by month\ntop products\nbad one\n")
+    items = load_items(questions_path)
+    results.append(check(len(items) == 3, "repeated questions are loaded once"))
+
+    for name, content, line_number in (
+        ("invalid.jsonl", '{"question": "ok"}\n{not json}\n', 2),
+        ("missing.jsonl", '{"question": "ok"}\n\n{"id": "x"}\n', 3),
+    ):
+        path = os.path.join(tmp_dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        try:
+            load_items(path)
+            results.append(check(False, f"{name} is rejected"))
+        except ValueError as e:
+            results.append(check(
+                f"{path}:{line_number}:" in str(e),
+                f"{name} is rejected with its line number ({e})",
+            ))
+
+    # 2. Skip-on-resume and retry-failed for every writer
+    for extension in (".jsonl", ".csv", ".parquet"):
+        path = os.path.join(tmp_dir, f"results{extension}")
+        first, _ = run_batch(path, questions_path)
+        second, calls = run_batch(path, questions_path)
+        third, retried = run_batch(path, questions_path, retry_failed=True)
+        results.append(check(
+            (first.succeeded, first.failed) == (2, 1)
+            and second.skipped == 3
+            and calls == 0
+            and third.skipped == 2
+            and retried == 1,
+            f"{extension}: resume skips recorded items, --retry-failed re-runs failures",
+        ))
+
+    # 3. CSV rows over 128 KB can be read back
+    csv_path = os.path.join(tmp_dir, "results.csv")
+    results.append(check(
+        os.path.getsize(csv_path) > 3 * 128 * 1024
+        and len(get_writer(csv_path).recorded_statuses()) == 3,
+        "CSV results with rows over 128 KB are read back on resume",
+    ))
+
+    # 4. Parquet part numbering continues across runs
+    parquet_path = os.path.join(tmp_dir, "results.parquet")
+    parts = sorted(os.listdir(parquet_path))
+    results.append(check(
+        parts == ["part-00000.parquet", "part-00001.parquet"],
+        f"Parquet runs add numbered parts ({', '.join(parts)})",
+    ))
+    writer = ParquetWriter(parquet_path, rows_per_part=1)
+    run_items = load_items(questions_path)
+    BatchRunner(FakeText2SQLClient(), FakeFlexlineClient()).run(
+        run_items, writer, retry_failed=True
+    )
+    parts = sorted(os.listdir(parquet_path))
+    results.append(check(
+        parts[-1] == "part-00002.parquet"
+        and not any(part.endswith(".tmp") for part in parts),
+        "a resumed Parquet run continues numbering after the last part",
+    ))
+
+    # 5. A failing writer stops the run instead of processing every item
+    many_path = os.path.join(tmp_dir, "many.txt")
+    with open(many_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(f"question {i}" for i in range(100)))
+    text2sql_client = FakeText2SQLClient()
+    try:
+        BatchRunner(text2sql_client, None, max_workers=2).run(
+            load_items(many_path),
+            FailingWriter(os.path.join(tmp_dir, "failing.jsonl")),
+        )
+        results.append(check(False, "a writer error is raised"))
+    except OSError:
+        results.append(check(
+            text2sql_client.calls < 100,
+            f"a writer error cancels pending items ({text2sql_client.calls}/100 ran)",
+        ))
+
+    shutil.rmtree(tmp_dir)
+    print(f"\n--- Test Finished: {sum(results)}/{len(results)} checks passed ---")
+
+
+if __name__ == "__main__":
+    run_batch_test()
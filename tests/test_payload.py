@@ -0,0 +1,68 @@
+import json
+import os
+import sys
+
+# We need to adjust the path to import from the app directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.flexline.payload import PayloadTooLargeError, read_lambda_payload
+
+
+class FakeStreamingBody:
+    """Stands in for botocore's StreamingBody, serving bytes in fixed chunks."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def iter_chunks(self, chunk_size: int):
+        for i in range(0, len(self.data), chunk_size):
+            yield self.data[i : i + chunk_size]
+
+    def close(self):
+        pass
+
+
+def run_payload_test():
+    """
+    Checks that the incremental Lambda payload reader matches a plain
+    `json.loads` of the same payload for any chunk size, and that the byte
+    budget aborts oversized responses.
+    """
+    print("--- Starting Lambda Payload Parsing Test ---")
+
+    rows = [
+        {"producto": f"P-{i}", "descripcion": 'Café "premium" \\ 😀', "cantidad": i * 1.5}
+        for i in range(200)
+    ]
+    payloads = {
+        "rows (escaped body)": {"statusCode": 200, "body": json.dumps(rows)},
+        "rows (raw unicode)": {
+            "body": json.dumps(rows, ensure_ascii=False, indent=1),
+            "statusCode": 200,
+        },
+        "error object": {"statusCode": 500, "body": json.dumps({"error": "Bad query"})},
+        "no body": {"statusCode": 200},
+    }
+
+    for name, payload in payloads.items():
+        data = json.dumps(payload).encode()
+        expected = (payload.get("statusCode"), json.loads(payload.get("body", "{}")))
+        for chunk_size in (1, 7, 64, 64 * 1024):
+            result = read_lambda_payload(FakeStreamingBody(data), chunk_size=chunk_size)
+            if result != expected:
+                print(f"\n🚨 TEST FAILED: '{name}' parsed differently with {chunk_size}-byte chunks.")
+                return
+        print(f"✅ {name}")
+
+    data = json.dumps(payloads["rows (escaped body)"]).encode()
+    try:
+        read_lambda_payload(FakeStreamingBody(data), max_bytes=len(data) // 2)
+        print("\n🚨 TEST FAILED: An oversized payload was not rejected.")
+        return
+    except PayloadTooLargeError as e:
+        print(f"✅ oversized payload rejected: {e}")
+
+    print("\n--- Test Finished ---")
+
+
+if __name__ == "__main__":
+    run_payload_test()
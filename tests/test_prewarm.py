@@ -0,0 +1,182 @@
+import os
+import sys
+import time
+from datetime import date, datetime
+
+# We need to adjust the path to import from the app directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.prewarm.cache import QueryCache
+from app.prewarm.scheduler import PrewarmScheduler
+
+
+class FakeText2SQLClient:
+    """Answers every question with canned SQL and counts the calls."""
+
+    def __init__(self, token: str | None = "token"):
+        self.token = token
+        self.updated_at = "2026-01-01T00:00:00Z"
+        self.details_available = True
+        self.sql_calls = 0
+
+    def authenticate(self, username: str, password: str) -> bool:
+        self.token = "token"
+        return True
+
+    def get_workspace_details(self) -> dict | None:
+        if not self.token or not self.details_available:
+            return None
+        return {"updated_at": self.updated_at}
+
+    def reauthenticate(self) -> bool:
+        return False
+
+    def get_sql(self, question: str) -> dict:
+        self.sql_calls += 1
+        return {"sql_query": f"SELECT '{question}'", "read_only": True}
+
+
+class FakeFlexlineClient:
+    def __init__(self):
+        self.run_calls = 0
+
+    def run(self, sql_query: str) -> list[dict]:
+        self.run_calls += 1
+        return [{"value": 1}]
+
+
+def check(condition: bool, message: str) -> bool:
+    print(f"{'✅' if condition else '🚨 TEST FAILED:'} {message}")
+    return condition
+
+
+def run_prewarm_test():
+    """
+    Exercises QueryCache and PrewarmScheduler with fake clients: the off-peak
+    window, the workspace `updated_at` skip rule, TTL expiry, size-based LRU
+    eviction and the spacing between pre-warm queries.
+    """
+    print("--- Starting Pre-warm Scheduler Test ---")
+    results = []
+
+    # 1. Off-peak window, including one that wraps past midnight
+    cache = QueryCache()
+    text2sql, flexline = FakeText2SQLClient(), FakeFlexlineClient()
+    scheduler = PrewarmScheduler(
+        text2sql, flexline, cache, window_start_hour=5, window_end_hour=7
+    )
+    results.append(check(
+        scheduler.in_window(datetime(2026, 1, 1, 5))
+        and scheduler.in_window(datetime(2026, 1, 1, 6, 59))
+        and not scheduler.in_window(datetime(2026, 1, 1, 7)),
+        "5-7h window contains 05:00-06:59 only",
+    ))
+    night = PrewarmScheduler(
+        text2sql, flexline, cache, window_start_hour=22, window_end_hour=2
+    )
+    results.append(check(
+        night.in_window(datetime(2026, 1, 1, 23))
+        and night.in_window(datetime(2026, 1, 1, 1))
+        and not night.in_window(datetime(2026, 1, 1, 2))
+        and not night.in_window(datetime(2026, 1, 1, 12)),
+        "22-2h window wraps past midnight",
+    ))
+
+    # 2. updated_at skip rule
+    scheduler.min_query_interval_seconds = 0
+    for question in ("top products", "sales by month"):
+        cache.record_question(question)
+    scheduler.warm_once()
+    results.append(
+        check(text2sql.sql_calls == 2, "first cycle generates SQL for each top question")
+    )
+    scheduler.warm_once()
+    results.append(
+        check(text2sql.sql_calls == 2, "unchanged updated_at skips SQL generation")
+    )
+    text2sql.details_available = False
+    scheduler.warm_once()
+    text2sql.details_available = True
+    scheduler.warm_once()
+    results.append(check(
+        text2sql.sql_calls == 2,
+        "a failed workspace lookup is not treated as a change",
+    ))
+    text2sql.updated_at = "2026-01-02T00:00:00Z"
+    scheduler.warm_once()
+    results.append(
+        check(text2sql.sql_calls == 4, "a new updated_at regenerates the SQL")
+    )
+    cache.set_workspace_version("2026-01-03T00:00:00Z")
+    results.append(check(
+        cache.get_sql("top products") is None,
+        "SQL cached for an older workspace version is not served",
+    ))
+
+    logged_out = FakeText2SQLClient(token=None)
+    PrewarmScheduler(
+        logged_out, flexline, cache, credentials=("user", "secret")
+    ).warm_once()
+    results.append(check(
+        logged_out.token is not None and logged_out.sql_calls > 0,
+        "the scheduler logs in by itself when it has no token",
+    ))
+
+    # 3. Popularity decays once per day and keeps fractional scores
+    scheduler._last_decay_date = date(2026, 1, 1)
+    scheduler._decay_daily(date(2026, 1, 2))
+    scheduler._decay_daily(date(2026, 1, 2))
+    results.append(check(
+        cache.top_questions(5) == ["top products", "sales by month"]
+        or cache.top_questions(5) == ["sales by month", "top products"],
+        "questions asked once survive a day of decay",
+    ))
+
+    # 4. TTL expiry
+    ttl_cache = QueryCache(results_ttl_seconds=0.05)
+    ttl_cache.put_results("SELECT 1", [{"value": 1}])
+    fresh = ttl_cache.get_results("SELECT 1") is not None
+    time.sleep(0.1)
+    results.append(check(
+        fresh and ttl_cache.get_results("SELECT 1") is None,
+        "results expire after their TTL",
+    ))
+
+    # 5. LRU eviction bounded by size in bytes
+    rows = [{"value": "x" * 100}]
+    lru_cache = QueryCache(max_bytes=300)
+    lru_cache.put_results("SELECT 1", rows)
+    lru_cache.put_results("SELECT 2", rows)
+    lru_cache.get_results("SELECT 1")  # Touch so SELECT 2 is least recently used
+    lru_cache.put_results("SELECT 3", rows)
+    results.append(check(
+        lru_cache.get_results("SELECT 2") is None
+        and lru_cache.get_results("SELECT 1") is not None
+        and lru_cache.get_results("SELECT 3") is not None
+        and lru_cache.size <= 300,
+        "least recently used results are evicted to stay within max_bytes",
+    ))
+    lru_cache.put_results("SELECT huge", [{"value": "x" * 1000}])
+    results.append(check(
+        lru_cache.get_results("SELECT huge") is None,
+        "results larger than max_bytes are not cached",
+    ))
+
+    # 6. Spacing between pre-warm queries
+    scheduler.min_query_interval_seconds = 0.1
+    scheduler._last_query_started = 0.0
+    starts = []
+    for _ in range(3):
+        scheduler._wait_for_query_slot()
+        starts.append(time.monotonic())
+    gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+    gap_labels = ", ".join(f"{gap:.2f}s" for gap in gaps)
+    results.append(check(
+        all(gap >= 0.095 for gap in gaps),
+        f"query starts are spaced by min_query_interval_seconds ({gap_labels})",
+    ))
+
+    print(f"\n--- Test Finished: {sum(results)}/{len(results)} checks passed ---")
+
+
+if __name__ == "__main__":
+    run_prewarm_test()
@@ -0,0 +1,90 @@
+import os
+import sys
+import threading
+import time
+
+# We need to adjust the path to import from the app directory
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.text2sql.client import Text2SQLClient
+from tests.stream_server import MALFORMED_RESPONSES, create_server
+
+
+def run_streaming_test(question: str):
+    """
+    Compares time-to-first-token of `get_sql_stream` against the total wait of
+    `get_sql`, using the local streaming stand-in server.
+    """
+    print("--- Starting Streaming SQL Generation Test ---")
+
+    server = create_server()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"Stand-in server running at {base_url}")
+
+    client = Text2SQLClient(base_url=base_url, workspace_id="local")
+    if not client.authenticate("local", "local"):
+        print("🚨 Authentication against the stand-in server failed.")
+        return
+
+    # 1. Blocking request
+    start = time.perf_counter()
+    blocking_response = client.get_sql(question)
+    blocking_total = time.perf_counter() - start
+
+    # 2. Streaming request
+    start = time.perf_counter()
+    first_token = None
+    sql_parts, explanation_parts = [], []
+    final = None
+    for event in client.get_sql_stream(question):
+        if first_token is None:
+            first_token = time.perf_counter() - start
+        if event["type"] == "sql":
+            sql_parts.append(event["text"])
+        elif event["type"] == "explanation":
+            explanation_parts.append(event["text"])
+        else:
+            final = event["data"]
+    streaming_total = time.perf_counter() - start
+
+    # 3. Malformed responses must end in a None final event, not an exception
+    malformed_failures = []
+    for malformed_question in MALFORMED_RESPONSES:
+        try:
+            events = list(client.get_sql_stream(malformed_question))
+            if events[-1] != {"type": "final", "data": None}:
+                malformed_failures.append(malformed_question)
+        except Exception as e:
+            malformed_failures.append(f"{malformed_question} ({e!r})")
+    server.shutdown()
+
+    print(f"\nBlocking get_sql:      {blocking_total:.2f}s until anything is shown")
+    print(f"Streaming first token: {first_token:.2f}s")
+    print(f"Streaming total:       {streaming_total:.2f}s")
+
+    if not final or not final.get("read_only"):
+        print("\n🚨 TEST FAILED: The stream did not end with a read-only payload.")
+        return
+    if "".join(sql_parts) != final["sql_query"]:
+        print("\n🚨 TEST FAILED: Streamed SQL tokens do not match the final query.")
+        return
+    if "".join(explanation_parts) != final["explanation"]:
+        print("\n🚨 TEST FAILED: Streamed explanation does not match the final one.")
+        return
+    if final != blocking_response:
+        print("\n🚨 TEST FAILED: Streaming and blocking responses differ.")
+        return
+    if malformed_failures:
+        print(
+            "\n🚨 TEST FAILED: Malformed responses were not rejected cleanly: "
+            + ", ".join(malformed_failures)
+        )
+        return
+    print(
+        "\n✅ Test Passed: Tokens streamed incrementally and match the final payload;"
+        " malformed responses were rejected."
+    )
+
+
+if __name__ == "__main__":
+    run_streaming_test("Que productos se venden mas segun la actividad del ultimo ano?")